@@ -16,7 +16,12 @@ class ConfigurationError(Exception):
 class Config(dict):
     """Simple over-ride of dict that adds a context manager."""
 
-    _defaults = {"direc": "~/21cmFAST-cache", "regenerate": False, "write": True}
+    _defaults = {
+        "direc": "~/21cmFAST-cache",
+        "regenerate": False,
+        "write": True,
+        "hash": "md5",
+    }
 
     _aliases = {"direc": ("boxdir",)}
 
@@ -85,7 +90,7 @@ class Config(dict):
 
     def _as_dict(self):
         """The plain dict defining the instance."""
-        return {k: str(Path) if isinstance(v, Path) else v for k, v in self.items()}
+        return {k: str(v) if isinstance(v, Path) else v for k, v in self.items()}
 
     @classmethod
     def load(cls, file_name: [str, Path]):
@@ -94,7 +99,7 @@ class Config(dict):
 
         if file_name.exists():
             with open(file_name) as fl:
-                cfg = yaml.load(fl)
+                cfg = yaml.safe_load(fl)
             return cls(cfg, file_name=file_name)
         else:
             return cls(write=False)
@@ -1,15 +1,15 @@
 """Utilities that help with wrapping various C structures."""
-import glob
 import h5py
 import logging
 import numpy as np
 import warnings
 from abc import ABCMeta, abstractmethod
 from bidict import bidict
+from cached_property import cached_property
 from cffi import FFI
 from enum import IntEnum
-from hashlib import md5
-from os import makedirs, path
+from hashlib import blake2b, md5
+from os import makedirs, path, scandir
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
@@ -17,10 +17,29 @@ from . import __version__
 from ._cfg import config
 from .c_21cmfast import lib
 
+try:
+    from xxhash import xxh3_128_hexdigest
+except ImportError:
+    xxh3_128_hexdigest = None
+
 _ffi = FFI()
 
 logger = logging.getLogger(__name__)
 
+# The layout of a compiled C struct never changes, so the (relatively slow) cffi
+# reflection used to find its fields is done only once per struct name.
+_FIELDS_CACHE: Dict[str, Dict[str, Any]] = {}
+_POINTER_FIELDS_CACHE: Dict[str, Tuple[str, ...]] = {}
+_PRIMITIVE_FIELDS_CACHE: Dict[str, Tuple[str, ...]] = {}
+
+# Incremented whenever an attribute of a StructInstanceWrapper (i.e. global_params) is
+# set. Some StructWithDefaults properties depend on global parameters, so their memoized
+# values are only valid for the generation in which they were computed.
+_global_params_generation = 0
+
+# cffi pointer types (e.g. "float *") of arrays passed to C, keyed by numpy dtype name.
+_POINTER_CTYPES_CACHE: Dict[str, Any] = {}
+
 
 class ArrayStateError(ValueError):
     """Errors arising from incorrectly modifying array state."""
@@ -31,6 +50,17 @@ class ArrayStateError(ValueError):
 class ArrayState:
     """Define the memory state of a struct array."""
 
+    __slots__ = ("_initialized", "_c_memory", "_computed_in_mem", "_on_disk")
+
+    def __getstate__(self):
+        """Return the state as a dict, the same form as before __slots__ were used."""
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __setstate__(self, state):
+        """Restore the state, including from objects pickled before __slots__."""
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def __init__(
         self, initialized=False, c_memory=False, computed_in_mem=False, on_disk=False
     ):
@@ -218,6 +248,42 @@ ctype2dtype["double"] = np.dtype("f8")
 ctype2dtype["int"] = np.dtype("i4")
 
 
+# Algorithms that may be set as config["hash"] to generate cache filenames. All of them
+# give 32-character hex digests. The cache is not a security boundary, so the faster
+# non-cryptographic options are perfectly safe -- but switching algorithm changes every
+# filename, so boxes cached with a different algorithm will not be found (and will be
+# re-computed).
+_HASHERS = {
+    "md5": lambda data: md5(data).hexdigest(),
+    "blake2b": lambda data: blake2b(data, digest_size=16).hexdigest(),
+    "xxh3": xxh3_128_hexdigest,
+}
+
+
+def hexdigest(data: bytes, algorithm: Optional[str] = None) -> str:
+    """Hash some data for use in a cache filename.
+
+    Parameters
+    ----------
+    data
+        The bytes to hash.
+    algorithm
+        One of "md5", "blake2b" or "xxh3" (the latter requires the ``xxhash`` package).
+        By default, the algorithm set as ``config["hash"]``.
+    """
+    algorithm = algorithm or config["hash"]
+    if algorithm not in _HASHERS:
+        raise ValueError(
+            f"Unknown hash algorithm '{algorithm}'. Must be one of {list(_HASHERS)}."
+        )
+
+    hasher = _HASHERS[algorithm]
+    if hasher is None:
+        raise ImportError(f"The '{algorithm}' hash requires the xxhash package.")
+
+    return hasher(data)
+
+
 def asarray(ptr, shape):
     """Get the canonical C type of the elements of ptr as a string."""
     ctype = _ffi.getctype(_ffi.typeof(ptr).item).split("*")[0].strip()
@@ -248,6 +314,9 @@ class StructWrapper:
     _name = None
     _ffi = None
 
+    # Whether the current C struct has been filled from this instance (see __call__).
+    _cstruct_filled = False
+
     def __init__(self):
 
         # Set the name of this struct in the C code
@@ -257,80 +326,107 @@ class StructWrapper:
     def _get_name(cls):
         return cls._name or cls.__name__
 
-    @property
+    @cached_property
     def _cstruct(self):
         """
         The actual structure which needs to be passed around to C functions.
 
         .. note:: This is best accessed by calling the instance (see __call__).
 
-        The reason it is defined as this (manual) cached property is so that it can be created
+        The reason it is defined as a cached property is so that it can be created
         dynamically, but not lost. It must not be lost, or else C functions which use it will lose
         access to its memory. But it also must be created dynamically so that it can be recreated
-        after pickling (pickle can't handle CData).
+        after pickling (pickle can't handle CData). Once created, it lives in the instance
+        ``__dict__``, so subsequent accesses are plain attribute lookups.
         """
-        try:
-            return self.__cstruct
-        except AttributeError:
-            self.__cstruct = self._new()
-            return self.__cstruct
+        return self._new()
 
     def _new(self):
         """Return a new empty C structure corresponding to this class."""
         return self._ffi.new("struct " + self._name + "*")
 
+    @classmethod
+    def _cache_fields(cls, cstruct=None) -> str:
+        """Populate the module-level field caches for this struct, returning its name."""
+        name = cls._get_name()
+        if name not in _FIELDS_CACHE:
+            if cstruct is None:
+                cstruct = cls._ffi.new("struct " + name + "*")
+            fields = dict(cls._ffi.typeof(cstruct[0]).fields)
+
+            _FIELDS_CACHE[name] = fields
+            _POINTER_FIELDS_CACHE[name] = tuple(
+                f for f, t in fields.items() if t.type.kind == "pointer"
+            )
+            _PRIMITIVE_FIELDS_CACHE[name] = tuple(
+                f for f, t in fields.items() if t.type.kind == "primitive"
+            )
+        return name
+
     @classmethod
     def get_fields(cls, cstruct=None) -> Dict[str, Any]:
         """Obtain the C-side fields of this struct."""
-        if cstruct is None:
-            cstruct = cls._ffi.new("struct " + cls._get_name() + "*")
-        return dict(cls._ffi.typeof(cstruct[0]).fields)
+        # Copy, so the shared cache can't be modified by the caller.
+        return dict(_FIELDS_CACHE[cls._cache_fields(cstruct)])
 
     @classmethod
     def get_fieldnames(cls, cstruct=None) -> List[str]:
         """Obtain the C-side field names of this struct."""
-        fields = cls.get_fields(cstruct)
-        return [f for f, t in fields]
+        return list(_FIELDS_CACHE[cls._cache_fields(cstruct)])
 
     @classmethod
     def get_pointer_fields(cls, cstruct=None) -> List[str]:
         """Obtain all pointer fields of the struct (typically simulation boxes)."""
-        return [f for f, t in cls.get_fields(cstruct) if t.type.kind == "pointer"]
+        return list(_POINTER_FIELDS_CACHE[cls._cache_fields(cstruct)])
 
     @property
     def fields(self) -> Dict[str, Any]:
         """List of fields of the underlying C struct (a list of tuples of "name, type")."""
-        return self.get_fields(self._cstruct)
+        return self.get_fields()
 
     @property
     def fieldnames(self) -> List[str]:
         """List names of fields of the underlying C struct."""
-        return [f for f, t in self.fields.items()]
+        return list(_FIELDS_CACHE[self._cache_fields()])
 
     @property
     def pointer_fields(self) -> List[str]:
         """List of names of fields which have pointer type in the C struct."""
-        return [f for f, t in self.fields.items() if t.type.kind == "pointer"]
+        return list(_POINTER_FIELDS_CACHE[self._cache_fields()])
 
     @property
     def primitive_fields(self) -> List[str]:
         """List of names of fields which have primitive type in the C struct."""
-        return [f for f, t in self.fields.items() if t.type.kind == "primitive"]
+        return list(_PRIMITIVE_FIELDS_CACHE[self._cache_fields()])
 
     def __getstate__(self):
-        """Return the current state of the class without pointers."""
-        return {
-            k: v
-            for k, v in self.__dict__.items()
-            if k not in ["_strings", "_StructWrapper__cstruct"]
-        }
+        """Return the current state of the class without pointers.
+
+        Memoized values are dropped too: string hashes differ between processes, so
+        they must be recomputed wherever the object is unpickled.
+
+        Any numpy arrays are left in the state as-is, so that with pickle protocol 5
+        (and a ``buffer_callback``) they are transferred out-of-band, without copying.
+        """
+        state = self.__dict__.copy()
+        for k in (
+            "_strings",
+            "_cstruct",
+            "_cstruct_filled",
+            "_repr_cache",
+            "_hash_cache",
+            "_pystruct_cache",
+            "_md5_cache",
+            "_cache_generation",
+        ):
+            state.pop(k, None)
+        return state
 
     def refresh_cstruct(self):
         """Delete the underlying C object, forcing it to be rebuilt."""
-        try:
-            del self.__cstruct
-        except AttributeError:
-            pass
+        self.__dict__.pop("_cstruct", None)
+        self.__dict__.pop("_strings", None)
+        self.__dict__.pop("_cstruct_filled", None)
 
     def __call__(self):
         """Return an instance of the C struct."""
@@ -362,6 +458,10 @@ class StructWithDefaults(StructWrapper):
     """
 
     _defaults_ = {}
+    _repr_cache = None
+    _hash_cache = None
+    _pystruct_cache = None
+    _cache_generation = None
 
     def __init__(self, *args, **kwargs):
 
@@ -385,24 +485,28 @@ class StructWithDefaults(StructWrapper):
                     f" None, dict, or an instance of itself"
                 )
 
-        for k, v in self._defaults_.items():
-
-            # Prefer arguments given to the constructor.
-            _v = kwargs.pop(k, None)
-
-            if _v is not None:
-                v = _v
+        # Prefer (non-None) arguments given to the constructor.
+        vals = {
+            **self._defaults_,
+            **{
+                k: v
+                for k, v in kwargs.items()
+                if v is not None and k in self._defaults_
+            },
+        }
 
+        for k, v in vals.items():
             try:
                 setattr(self, k, v)
             except AttributeError:
                 # The attribute has been defined as a property, save it as a hidden variable
                 setattr(self, "_" + k, v)
 
-        if kwargs:
+        unsupported = [k for k in kwargs if k not in self._defaults_]
+        if unsupported:
             logger.warning(
                 "The following parameters to {thisclass} are not supported: {lst}".format(
-                    thisclass=self.__class__.__name__, lst=list(kwargs.keys())
+                    thisclass=self.__class__.__name__, lst=unsupported
                 )
             )
 
@@ -426,17 +530,16 @@ class StructWithDefaults(StructWrapper):
         # Start a fresh cstruct.
         if kwargs:
             self.refresh_cstruct()
+            self._invalidate_cache()
 
-        for k in self._defaults_:
-            # Prefer arguments given to the constructor.
-            if k in kwargs:
-                v = kwargs.pop(k)
+        for k in self._defaults_.keys() & kwargs.keys():
+            v = kwargs.pop(k)
 
-                try:
-                    setattr(self, k, v)
-                except AttributeError:
-                    # The attribute has been defined as a property, save it as a hidden variable
-                    setattr(self, "_" + k, v)
+            try:
+                setattr(self, k, v)
+            except AttributeError:
+                # The attribute has been defined as a property, save it as a hidden variable
+                setattr(self, "_" + k, v)
 
         # Also ensure that parameters that are part of the class, but not the defaults, are set
         # this will fail if these parameters cannot be set for some reason, hence doing it
@@ -451,6 +554,32 @@ class StructWithDefaults(StructWrapper):
                 % kwargs
             )
 
+    def _invalidate_cache(self):
+        """Forget any values memoized from the current parameters."""
+        self._repr_cache = None
+        self._hash_cache = None
+        self._pystruct_cache = None
+
+    def _check_global_params(self):
+        """Forget memoized values if global parameters changed since they were made.
+
+        Some properties (eg. ``AstroParams.NU_X_THRESH``) are validated against global
+        parameters, so must be re-evaluated (and the C struct re-filled) when they change.
+        """
+        if self._cache_generation != _global_params_generation:
+            self._invalidate_cache()
+            self.__dict__.pop("_cstruct_filled", None)
+            self._cache_generation = _global_params_generation
+
+    @cached_property
+    def _strings(self):
+        """C strings pointed to by the C struct, keyed by (field, value).
+
+        These must be kept alive for as long as the C struct uses them, and are re-used
+        while the string value is unchanged.
+        """
+        return {}
+
     def clone(self, **kwargs):
         """Make a fresh copy of the instance with arbitrary parameters updated."""
         new = self.__class__(self.self)
@@ -459,25 +588,49 @@ class StructWithDefaults(StructWrapper):
 
     def __call__(self):
         """Return a filled C Structure corresponding to this instance."""
-        for key, val in self.pystruct.items():
+        cstruct = self._cstruct
 
+        # Parameters may only change through update(), which discards the C struct, and
+        # a change to global params also marks it as unfilled. Otherwise a struct that
+        # has already been filled is still current.
+        self._check_global_params()
+        if self._cstruct_filled:
+            return cstruct
+
+        strings = self._strings
+        convert = self.convert
+
+        for key in _FIELDS_CACHE[self._cache_fields()]:
             # Find the value of this key in the current class
+            val = convert(key, getattr(self, key))
+
             if isinstance(val, str):
                 # If it is a string, need to convert it to C string ourselves.
-                val = self.ffi.new("char[]", getattr(self, key).encode())
+                cdata = strings.get((key, val))
+                if cdata is None:
+                    cdata = strings[(key, val)] = self._ffi.new("char[]", val.encode())
+                val = cdata
 
             try:
-                setattr(self._cstruct, key, val)
+                setattr(cstruct, key, val)
             except TypeError:
                 logger.info(f"For key {key}, value {val}:")
                 raise
 
-        return self._cstruct
+        self._cstruct_filled = True
+        return cstruct
 
     @property
     def pystruct(self):
         """A pure-python dictionary representation of the corresponding C structure."""
-        return {fld: self.convert(fld, getattr(self, fld)) for fld in self.fieldnames}
+        self._check_global_params()
+        if self._pystruct_cache is None:
+            self._pystruct_cache = {
+                fld: self.convert(fld, getattr(self, fld))
+                for fld in _FIELDS_CACHE[self._cache_fields()]
+            }
+        # Return a copy so the memoized version can't be modified by the caller.
+        return dict(self._pystruct_cache)
 
     @property
     def defining_dict(self):
@@ -513,20 +666,36 @@ class StructWithDefaults(StructWrapper):
 
     def __repr__(self):
         """Full unique representation of the instance."""
-        return (
-            self.__class__.__name__
-            + "("
-            + ", ".join(sorted(k + ":" + str(v) for k, v in self.defining_dict.items()))
-            + ")"
-        )
+        # Parameters may only be changed via update(), which clears this cache (as does
+        # changing global params).
+        self._check_global_params()
+        if self._repr_cache is None:
+            self._repr_cache = (
+                self.__class__.__name__
+                + "("
+                + ", ".join(
+                    sorted(k + ":" + str(v) for k, v in self.defining_dict.items())
+                )
+                + ")"
+            )
+        return self._repr_cache
 
     def __eq__(self, other):
         """Check whether this instance is equal to another object (by checking the __repr__)."""
-        return self.__repr__() == repr(other)
+        if self is other:
+            return True
+        if not isinstance(other, StructWithDefaults):
+            return NotImplemented
+
+        # Comparing the (memoized) reprs keeps equality consistent with __hash__.
+        return self.__repr__() == other.__repr__()
 
     def __hash__(self):
         """Generate a unique hsh for the instance."""
-        return hash(self.__repr__())
+        self._check_global_params()
+        if self._hash_cache is None:
+            self._hash_cache = hash(self.__repr__())
+        return self._hash_cache
 
     def __str__(self):
         """Human-readable string representation of the object."""
@@ -539,6 +708,18 @@ class StructWithDefaults(StructWrapper):
     """
 
 
+def _expand_direc(direc: Union[str, Path, None] = None) -> str:
+    """Return the absolute path of a directory, by default the cache directory."""
+    direc = direc or config["direc"]
+
+    # The configured directory is usually already stored as an absolute Path (see
+    # Config), in which case there's nothing to expand.
+    if isinstance(direc, Path) and direc.is_absolute():
+        return str(direc)
+
+    return path.abspath(path.expanduser(direc))
+
+
 def snake_to_camel(word: str, publicize: bool = True):
     """Convert snake case to camel case."""
     if publicize:
@@ -580,6 +761,9 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
 
     _TYPEMAP = bidict({"float32": "float *", "float64": "double *", "int32": "int *"})
 
+    # (seedless repr, algorithm, hash) of the last hash computed, see _md5.
+    _md5_cache = None
+
     def __init__(self, *, random_seed=None, dummy=False, initial=False, **kwargs):
         """
         Base type for output structures from C functions.
@@ -627,8 +811,9 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
         self._array_state = {k: ArrayState() for k in self._array_structure}
         self._array_state.update({k: ArrayState() for k in self._c_based_pointers})
 
+        pointer_fields = _POINTER_FIELDS_CACHE[self._cache_fields()]
         for k in self._array_structure:
-            if k not in self.pointer_fields:
+            if k not in pointer_fields:
                 raise TypeError(f"Key {k} in {self} not a defined pointer field in C.")
 
     @property
@@ -672,6 +857,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
         return [c for c in all_classes if not c._meta]
 
     def _init_arrays(self):
+        fields = _FIELDS_CACHE[self._cache_fields()]
         for k, state in self._array_state.items():
             if k == "lowres_density":
                 logger.debug("THINKING ABOUT INITING LOWRES_DENSITY")
@@ -685,7 +871,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
                 continue
 
             params = self._array_structure[k]
-            tp = self._TYPEMAP.inverse[self.fields[k].type.cname]
+            tp = self._TYPEMAP.inverse[fields[k].type.cname]
 
             if isinstance(params, tuple):
                 shape = params
@@ -700,6 +886,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
 
             # Add it to initialized arrays.
             state.initialized = True
+            self.__dict__.pop("_cstruct_filled", None)
 
     @property
     def random_seed(self):
@@ -712,6 +899,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
     def _init_cstruct(self):
         # Initialize all uninitialized arrays.
         self._init_arrays()
+        cstruct = self._cstruct
 
         for k, state in self._array_state.items():
             # We do *not* set COMPUTED_ON_DISK items to the C-struct here, because we have no
@@ -719,32 +907,42 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
             # to unnecessarily load things in. We leave it to the user to ensure that all
             # required arrays are loaded into memory before calling this function.
             if state.initialized:
-                setattr(self._cstruct, k, self._ary2buf(getattr(self, k)))
+                setattr(cstruct, k, self._ary2buf(getattr(self, k)))
 
-        for k in self.primitive_fields:
+        for k in _PRIMITIVE_FIELDS_CACHE[self._cache_fields()]:
             try:
-                setattr(self._cstruct, k, getattr(self, k))
+                setattr(cstruct, k, getattr(self, k))
             except AttributeError:
                 pass
 
+        self._cstruct_filled = True
+
     def _ary2buf(self, ary):
         if not isinstance(ary, np.ndarray):
             raise ValueError("ary must be a numpy array")
-        return self._ffi.cast(
-            OutputStruct._TYPEMAP[ary.dtype.name], self._ffi.from_buffer(ary)
-        )
+
+        name = ary.dtype.name
+        ctype = _POINTER_CTYPES_CACHE.get(name)
+        if ctype is None:
+            ctype = _POINTER_CTYPES_CACHE[name] = self._ffi.typeof(
+                OutputStruct._TYPEMAP[name]
+            )
+        return self._ffi.cast(ctype, self._ffi.from_buffer(ary))
 
     def __call__(self):
         """Initialize/allocate a fresh C struct in memory and return it."""
-        if not self.dummy:
+        # Arrays only change via _init_arrays, _remove_array or read, which all mark
+        # the C struct as needing to be filled again.
+        if not self.dummy and not self._cstruct_filled:
             self._init_cstruct()
 
         return self._cstruct
 
     def __expose(self):
         """Expose the non-array primitives of the ctype to the top-level object."""
-        for k in self.primitive_fields:
-            setattr(self, k, getattr(self._cstruct, k))
+        cstruct = self._cstruct
+        for k in _PRIMITIVE_FIELDS_CACHE[self._cache_fields()]:
+            setattr(self, k, getattr(cstruct, k))
 
     @property
     def _fname_skeleton(self):
@@ -811,6 +1009,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
 
         delattr(self, k)
         state.initialized = False
+        self.__dict__.pop("_cstruct_filled", None)
 
     def __getattr__(self, item):
         """Gets arrays that aren't already in memory."""
@@ -849,17 +1048,30 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
         return self._fname_skeleton.format(seed=self.random_seed)
 
     def _get_fname(self, direc=None):
-        direc = path.abspath(path.expanduser(direc or config["direc"]))
-        return path.join(direc, self.filename)
+        return path.join(_expand_direc(direc), self.filename)
 
     def _find_file_without_seed(self, direc):
-        allfiles = glob.glob(path.join(direc, self._fname_skeleton.format(seed="*")))
+        prefix, suffix = self._fname_skeleton.split("{seed}")
 
-        if allfiles:
-            return allfiles[0]
-        else:
+        # Scan the directory ourselves so we can stop at the first match, rather than
+        # globbing the whole directory.
+        try:
+            entries = scandir(direc)
+        except OSError:
             return None
 
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith(prefix)
+                    and name.endswith(suffix)
+                    and name[len(prefix) : -len(suffix)].isdigit()
+                    and entry.is_file()
+                ):
+                    return path.join(direc, name)
+        return None
+
     def find_existing(self, direc=None):
         """
         Try to find existing boxes which match the parameters of this instance.
@@ -878,15 +1090,16 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
         # First, if appropriate, find a file without specifying seed.
         # Need to do this first, otherwise the seed will be chosen randomly upon
         # choosing a filename!
-        direc = path.expanduser(direc or config["direc"])
+        direc = _expand_direc(direc)
 
         if not self._random_seed:
             f = self._find_file_without_seed(direc)
             if f and self._check_parameters(f):
                 return f
         else:
-            f = self._get_fname(direc)
-            if path.exists(f) and self._check_parameters(f):
+            # direc is already expanded, so don't go through _get_fname.
+            f = path.join(direc, self.filename)
+            if path.isfile(f) and self._check_parameters(f):
                 return f
         return None
 
@@ -970,7 +1183,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
             mode = "a"
 
         try:
-            direc = path.expanduser(direc or config["direc"])
+            direc = _expand_direc(direc)
 
             if not path.exists(direc):
                 makedirs(direc)
@@ -1029,11 +1242,20 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
         """
         # Go through all fields in this struct, and save
         for k, state in self._array_state.items():
-            group.create_dataset(k, data=getattr(self, k))
+            arr = getattr(self, k)
+            if arr.ndim and arr.size:
+                # Light (level 1) gzip is standard deflate, readable by any HDF5 tool.
+                # Scalar/empty datasets can't be chunked, so they are written plainly.
+                group.create_dataset(
+                    k, data=arr, chunks=True, compression="gzip", compression_opts=1
+                )
+            else:
+                group.create_dataset(k, data=arr)
             state.on_disk = True
 
-        for k in self.primitive_fields:
-            group.attrs[k] = getattr(self, k)
+        group.attrs.update(
+            {k: getattr(self, k) for k in _PRIMITIVE_FIELDS_CACHE[self._cache_fields()]}
+        )
 
     def save(self, fname=None, direc="."):
         """Save the box to disk.
@@ -1111,7 +1333,23 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
             # Set our arrays.
             for k in boxes.keys():
                 if keys is None or k in keys:
-                    setattr(self, k, boxes[k][...])
+                    dset = boxes[k]
+                    arr = self.__dict__.get(k)
+
+                    # Read straight into existing memory where possible, to avoid
+                    # allocating a second full-size array.
+                    if (
+                        self._array_state[k].initialized
+                        and isinstance(arr, np.ndarray)
+                        and arr.shape == dset.shape
+                        and arr.dtype == dset.dtype
+                        and arr.flags.c_contiguous
+                        and arr.flags.writeable
+                        and arr.size
+                    ):
+                        dset.read_direct(arr)
+                    else:
+                        setattr(self, k, dset[...])
                     self._array_state[k].on_disk = True
                     self._array_state[k].computed_in_mem = True
                     setattr(self._cstruct, k, self._ary2buf(getattr(self, k)))
@@ -1141,6 +1379,8 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
             seed = f.attrs["random_seed"]
             self._random_seed = seed
 
+        self.__dict__.pop("_cstruct_filled", None)
+
         self.__expose()
         self._paths.insert(0, Path(pth))
 
@@ -1160,7 +1400,7 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
             instance is created with input parameters -- the instance can read data
             with the :func:`read` method.
         """
-        direc = path.expanduser(direc or config["direc"])
+        direc = _expand_direc(direc)
 
         if not path.exists(fname):
             fname = path.join(direc, fname)
@@ -1246,8 +1486,15 @@ class OutputStruct(StructWrapper, metaclass=ABCMeta):
 
     @property
     def _md5(self):
-        """Return a unique hsh of the object, *not* taking into account the random seed."""
-        return md5(self._seedless_repr().encode()).hexdigest()
+        """Return a unique hsh of the object, *not* taking into account the random seed.
+
+        Despite the name, the algorithm used is set by ``config["hash"]`` (default md5).
+        """
+        rep = self._seedless_repr()
+        algorithm = config["hash"]
+        if self._md5_cache is None or self._md5_cache[:2] != (rep, algorithm):
+            self._md5_cache = (rep, algorithm, hexdigest(rep.encode(), algorithm))
+        return self._md5_cache[2]
 
     def __eq__(self, other):
         """Check equality with another object via its __repr__."""
@@ -1456,12 +1703,19 @@ class StructInstanceWrapper:
 
     def __setattr__(self, name, value):
         """Set an attribute of the instance, attempting to change it in the C struct as well."""
+        global _global_params_generation
+
         try:
             setattr(self._cobj, name, value)
         except AttributeError:
             pass
         object.__setattr__(self, name, value)
 
+        # Any change may alter the representation, so forget the memoized ones, and
+        # those of any StructWithDefaults.
+        self.__dict__.pop("_repr_cache", None)
+        _global_params_generation += 1
+
     def items(self):
         """Yield (name, value) pairs for each element of the struct."""
         for nm, tp in self._ffi.typeof(self._cobj).fields:
@@ -1473,11 +1727,7 @@ class StructInstanceWrapper:
 
     def __repr__(self):
         """Return a unique representation of the instance."""
-        return (
-            self._ctype
-            + "("
-            + ";".join(k + "=" + str(v) for k, v in sorted(self.items()))
-        ) + ")"
+        return self.filtered_repr(())
 
     def filtered_repr(self, filter_params):
         """Get a fully unique representation of the instance that filters out some parameters.
@@ -1487,15 +1737,20 @@ class StructInstanceWrapper:
         filter_params : list of str
             The parameter names which should not appear in the representation.
         """
-        return (
-            self._ctype
-            + "("
-            + ";".join(
-                k + "=" + str(v)
-                for k, v in sorted(self.items())
-                if k not in filter_params
-            )
-        ) + ")"
+        # Memoized until the next attribute is set (see __setattr__).
+        cache = self.__dict__.setdefault("_repr_cache", {})
+        key = tuple(filter_params)
+        if key not in cache:
+            cache[key] = (
+                self._ctype
+                + "("
+                + ";".join(
+                    k + "=" + str(v)
+                    for k, v in sorted(self.items())
+                    if k not in filter_params
+                )
+            ) + ")"
+        return cache[key]
 
 
 def _check_compatible_inputs(*datasets, ignore=["redshift"]):
@@ -87,13 +87,17 @@ def readbox(
     return inst
 
 
+_FNAME_PATTERNS = (
+    re.compile(r"(?P<kind>\w+)_(?P<hash>\w{32})_r(?P<seed>\d+).h5$"),
+    re.compile(
+        r"(?P<kind>\w+)_z(?P<redshift>\d+.\d{1,4})_(?P<hash>\w{32})_r(?P<seed>\d+).h5$"
+    ),
+)
+
+
 def _parse_fname(fname):
-    patterns = (
-        r"(?P<kind>\w+)_(?P<hash>\w{32})_r(?P<seed>\d+).h5$",
-        r"(?P<kind>\w+)_z(?P<redshift>\d+.\d{1,4})_(?P<hash>\w{32})_r(?P<seed>\d+).h5$",
-    )
-    for pattern in patterns:
-        match = re.match(pattern, os.path.basename(fname))
+    for pattern in _FNAME_PATTERNS:
+        match = pattern.match(os.path.basename(fname))
         if match:
             break
 
@@ -134,15 +138,17 @@ def list_datasets(*, direc=None, kind=None, hsh=None, seed=None, redshift=None):
     """
     direc = path.expanduser(direc or config["direc"])
 
-    fname = "{}{}_{}_r{}.h5".format(
-        kind or r"(?P<kind>[a-zA-Z]+)",
-        f"_z{redshift:.4f}" if redshift is not None else "(.*)",
-        hsh or r"(?P<hash>\w{32})",
-        seed or r"(?P<seed>\d+)",
+    fname = re.compile(
+        "{}{}_{}_r{}.h5".format(
+            kind or r"(?P<kind>[a-zA-Z]+)",
+            f"_z{redshift:.4f}" if redshift is not None else "(.*)",
+            hsh or r"(?P<hash>\w{32})",
+            seed or r"(?P<seed>\d+)",
+        )
     )
 
     for fl in os.listdir(direc):
-        if re.match(fname, fl):
+        if fname.match(fl):
             yield fl
 
 
@@ -18,7 +18,6 @@ import warnings
 from astropy import units
 from astropy.cosmology import z_at_value
 from cached_property import cached_property
-from hashlib import md5
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
@@ -809,7 +808,7 @@ class _HighLevelOutput:
     def get_unique_filename(self):
         """Generate a unique hash filename for this instance."""
         return self._get_prefix().format(
-            hash=md5((self._input_rep() + self._particular_rep()).encode()).hexdigest()
+            hash=_ut.hexdigest((self._input_rep() + self._particular_rep()).encode())
         )
 
     def _write(self, direc=None, fname=None, clobber=False):
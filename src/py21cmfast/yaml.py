@@ -6,6 +6,11 @@ objects with astropy quantities in them.
 import yaml
 from astropy.io.misc import yaml as ayaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 
 class _NewDumper(yaml.Dumper, ayaml.AstropyDumper):
     pass
@@ -45,6 +50,11 @@ def load(stream):
     return yaml.load(stream, Loader=_NewLoader)
 
 
+def safe_load(stream):
+    """Load plain (non-astropy) objects from a YAML stream, using libyaml if available."""
+    return yaml.load(stream, Loader=_SafeLoader)
+
+
 def dump(data, stream=None, **kwargs):
     """Dump an object into a YAML stream."""
     kwargs["Dumper"] = _NewDumper
@@ -45,3 +45,23 @@ def test_config_write(cfgdir):
 
     assert "boxdir" not in new_config
     assert "direc" in new_config
+
+
+def test_config_upgrade_keeps_direc(tmp_path):
+    cfg_file = tmp_path / "config.yml"
+    direc = tmp_path / "cache"
+
+    # A config file written before the 'hash' option existed.
+    with open(cfg_file, "w") as fl:
+        yaml.dump({"direc": str(direc), "regenerate": False, "write": True}, fl)
+
+    with pytest.warns(UserWarning):
+        cfg = Config.load(cfg_file)
+
+    assert cfg["hash"] == "md5"
+    assert cfg["direc"] == direc
+
+    # The file was re-written on upgrade, and must still point at the same place.
+    cfg = Config.load(cfg_file)
+    assert cfg["direc"] == direc
+    assert cfg["hash"] == "md5"
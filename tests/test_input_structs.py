@@ -87,6 +87,16 @@ def test_pickle(c):
     assert c4._cstruct.SIGMA_8 == c._cstruct.SIGMA_8
 
 
+def test_pickle_drops_memoized_values(c):
+    hash(c)
+    c4 = pickle.loads(pickle.dumps(c))
+
+    # The hash of a string is only valid within one process, so must not be pickled.
+    assert c4._hash_cache is None
+    assert c4._repr_cache is None
+    assert hash(c4) == hash(c)
+
+
 def test_self(c):
     c5 = CosmoParams(c.self)
     assert c5 == c
@@ -108,6 +118,18 @@ def test_update():
     assert c_pystruct != c.pystruct
 
 
+def test_update_changes_repr_and_hash():
+    c = CosmoParams()
+    r = repr(c)
+    h = hash(c)
+    c.update(SIGMA_8=0.9)
+
+    assert repr(c) != r
+    assert "SIGMA_8:0.9" in repr(c)
+    assert hash(c) != h
+    assert hash(c) == hash(CosmoParams(SIGMA_8=0.9))
+
+
 def test_c_structures(c):
     # See if the C structures are behaving correctly
     c2 = CosmoParams(SIGMA_8=0.8)
@@ -175,3 +197,18 @@ def test_interpolation_table_warning():
     with pytest.warns(None) as record:
         UserParams(USE_INTERPOLATION_TABLES=True).USE_INTERPOLATION_TABLES
     assert not record
+
+
+def test_nu_x_thresh_follows_global_params():
+    ap = AstroParams(NU_X_THRESH=500)
+    ap()
+    repr(ap)
+
+    # Already filled/memoized values must still be validated against new globals.
+    with global_params.use(NU_X_BAND_MAX=400):
+        with pytest.raises(ValueError):
+            ap()
+        with pytest.raises(ValueError):
+            repr(ap)
+
+    ap()
@@ -5,11 +5,13 @@ Unit tests for output structures
 import pytest
 
 import copy
+import h5py
 import numpy as np
 import pickle
 
 from py21cmfast import InitialConditions  # An example of an output struct
-from py21cmfast import IonizedBox, PerturbedField, TsBox, global_params
+from py21cmfast import IonizedBox, PerturbedField, TsBox, config, global_params
+from py21cmfast._utils import ArrayState
 
 
 @pytest.fixture(scope="function")
@@ -77,6 +79,25 @@ def test_different_seeds(init, default_user_params):
     assert init._random_seed is None
 
 
+def test_md5_follows_global_params(init):
+    md5 = init._md5
+    assert init._md5 == md5
+
+    with global_params.use(M_WDM=global_params.M_WDM + 1):
+        assert init._md5 != md5
+
+    assert init._md5 == md5
+
+
+@pytest.mark.parametrize("algorithm", ["blake2b", "md5"])
+def test_md5_algorithm(init, algorithm):
+    with config.use(hash=algorithm):
+        hsh = init._md5
+
+    assert len(hsh) == 32
+    assert (hsh == init._md5) == (algorithm == config["hash"])
+
+
 def test_pickleability(default_user_params):
     ic_ = InitialConditions(init=True, user_params=default_user_params)
     ic_.filled = True
@@ -88,6 +109,66 @@ def test_pickleability(default_user_params):
     assert repr(ic_) == repr(ic2)
 
 
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="requires pickle protocol 5")
+def test_pickle_out_of_band(default_user_params):
+    ic_ = InitialConditions(user_params=default_user_params)
+    ic_._init_arrays()
+
+    buffers = []
+    s = pickle.dumps(ic_, protocol=5, buffer_callback=buffers.append)
+    assert buffers
+
+    ic2 = pickle.loads(s, buffers=buffers)
+    assert repr(ic_) == repr(ic2)
+    assert np.all(ic2.lowres_density == ic_.lowres_density)
+
+
+def test_write_read_roundtrip(default_user_params, test_direc):
+    ic_ = InitialConditions(user_params=default_user_params, random_seed=3)
+    ic_._init_arrays()
+    for k, state in ic_._array_state.items():
+        getattr(ic_, k)[...] = np.random.random(getattr(ic_, k).shape)
+        state.computed_in_mem = True
+
+    ic_.write(direc=test_direc)
+
+    with h5py.File(ic_.path, "r") as fl:
+        assert fl["InitialConditions"]["lowres_density"].compression == "gzip"
+
+    # Read into already-allocated arrays (read_direct) ...
+    ic2 = InitialConditions(user_params=default_user_params, random_seed=3)
+    ic2._init_arrays()
+    lowres_density = ic2.lowres_density
+    ic2.read(direc=test_direc)
+    assert ic2.lowres_density is lowres_density
+
+    # ... and into fresh ones.
+    ic3 = InitialConditions(user_params=default_user_params, random_seed=3)
+    ic3.read(direc=test_direc)
+
+    for k in ic_._array_state:
+        assert np.all(getattr(ic2, k) == getattr(ic_, k))
+        assert np.all(getattr(ic3, k) == getattr(ic_, k))
+
+
+def test_array_state_pickle():
+    state = ArrayState(initialized=True, on_disk=True)
+    state2 = pickle.loads(pickle.dumps(state))
+    assert state2.initialized and state2.on_disk and not state2.c_memory
+
+    # States pickled before ArrayState had __slots__ were its plain __dict__.
+    old = ArrayState.__new__(ArrayState)
+    old.__setstate__(
+        {
+            "_initialized": True,
+            "_c_memory": False,
+            "_computed_in_mem": True,
+            "_on_disk": False,
+        }
+    )
+    assert old.computed_in_mem and not old.on_disk
+
+
 def test_fname(default_user_params):
     ic1 = InitialConditions(user_params=default_user_params)
     ic2 = InitialConditions(user_params=default_user_params)